@@ -0,0 +1,105 @@
+"""
+Redis read-through cache for the food tracking system.
+Caches responses from read-heavy endpoints and invalidates them on writes.
+
+Caching is optional: if REDIS_URL is not set or the redis package is not
+installed, every helper degrades to a no-op and endpoints hit the database
+directly.
+"""
+
+import os
+import logging
+from typing import Any, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+# All cached keys share this prefix so a single scan can invalidate them
+KEY_PREFIX = "foods:"
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+_client = None
+
+
+def init_cache() -> bool:
+    """
+    Connect to Redis if configured. Call once at application startup.
+
+    Returns:
+        bool: True if the cache is active, False if caching is disabled
+    """
+    global _client
+    if not REDIS_URL:
+        logger.info("REDIS_URL not set, response caching disabled")
+        return False
+    if redis is None:
+        logger.warning("redis package not installed, response caching disabled")
+        return False
+    try:
+        client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        client.ping()
+        _client = client
+        logger.info("Redis cache connected")
+        return True
+    except Exception as e:
+        logger.warning(f"Redis unavailable, response caching disabled: {e}")
+        _client = None
+        return False
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """
+    Get a cached value by key.
+
+    Args:
+        key: Cache key (without prefix)
+
+    Returns:
+        The cached value, or None on a miss or when caching is disabled
+    """
+    if _client is None:
+        return None
+    try:
+        hit = _client.get(KEY_PREFIX + key)
+        return orjson.loads(hit) if hit is not None else None
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+
+def cache_set(key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+    """
+    Store a JSON-serializable value in the cache.
+
+    Args:
+        key: Cache key (without prefix)
+        value: JSON-serializable value to store
+        ttl: Time to live in seconds
+    """
+    if _client is None:
+        return
+    try:
+        _client.setex(KEY_PREFIX + key, ttl, orjson.dumps(value))
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def invalidate_foods() -> None:
+    """Drop every cached food/inventory response after a write."""
+    if _client is None:
+        return
+    try:
+        keys = list(_client.scan_iter(KEY_PREFIX + "*"))
+        if keys:
+            _client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed: {e}")
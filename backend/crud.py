@@ -3,18 +3,40 @@ CRUD operations for the food tracking system.
 Provides functions to create, read, update, and delete food items and nutrition logs.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, TYPE_CHECKING
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, insert
 from datetime import datetime, date
-import pandas as pd
+import csv
+import io
+import json
+import uuid
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 from models import Food, NutritionLog
-from database import get_db_session
+from database import get_db_session, get_engine
 
 logger = logging.getLogger(__name__)
 
+# Above this row count, PostgreSQL imports bypass the ORM and stream new
+# rows through COPY instead of issuing one INSERT per row
+BULK_COPY_THRESHOLD = 500
+
+# Column order for the COPY statement; created_at is omitted so the table
+# default applies
+FOOD_COPY_COLUMNS = [
+    'id', 'barcode', 'name', 'brand', 'category', 'calories', 'protein',
+    'fat', 'carbs', 'fiber', 'sugars', 'sodium', 'allergens', 'expiry_date',
+    'quantity', 'location'
+]
+
+# INTEGER columns in the COPY stream; pandas promotes these to float64 when
+# any row is missing a value, and COPY rejects '3.0' as integer input
+FOOD_INTEGER_COLUMNS = ('calories', 'quantity')
+
 
 # Food CRUD Operations
 
@@ -256,17 +278,19 @@ def get_nutrition_logs(db: Session, food_id: Optional[str] = None,
 
 # Bulk Import Operations
 
-def bulk_import_from_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
+def bulk_import_from_dataframe(df: "pd.DataFrame") -> Dict[str, Any]:
     """
     Import food data from a pandas DataFrame.
     Performs upsert operations (insert or update if barcode exists).
-    
+
     Args:
         df: Pandas DataFrame containing food data
-        
+
     Returns:
         Dict: Summary of import results
     """
+    # Deferred so the API can boot without pandas loaded
+    import pandas as pd
     results = {
         "total_rows": len(df),
         "inserted": 0,
@@ -274,26 +298,37 @@ def bulk_import_from_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
         "errors": 0,
         "error_details": []
     }
-    
+
+    # Large PostgreSQL imports stream new rows through COPY instead of
+    # building one ORM object and INSERT per row
+    if len(df) > BULK_COPY_THRESHOLD and get_engine().dialect.name == 'postgresql':
+        return _bulk_import_via_copy(df, results)
+
     with get_db_session() as db:
+        new_records = []
+        # Pending inserts by barcode, so repeated barcodes within one
+        # payload merge into the pending row (upsert semantics) instead of
+        # inserting twice
+        pending_by_barcode = {}
         for index, row in df.iterrows():
             try:
                 # Convert row to dictionary, handling NaN values
                 food_data = row.to_dict()
                 food_data = {k: v for k, v in food_data.items() if pd.notna(v)}
-                
+
                 # Convert expiry_date string to date object if present
                 if 'expiry_date' in food_data and isinstance(food_data['expiry_date'], str):
                     try:
-                        from datetime import datetime
                         food_data['expiry_date'] = datetime.strptime(food_data['expiry_date'], '%Y-%m-%d').date()
                     except ValueError:
                         # Invalid date format, remove it
                         food_data.pop('expiry_date', None)
-                
+
+                barcode = food_data.get('barcode')
+
                 # Check if food already exists by barcode
-                existing_food = get_food_by_barcode(db, food_data.get('barcode'))
-                
+                existing_food = get_food_by_barcode(db, barcode)
+
                 if existing_food:
                     # Update existing food
                     for key, value in food_data.items():
@@ -302,22 +337,177 @@ def bulk_import_from_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
                     db.commit()
                     results["updated"] += 1
                     logger.info(f"Updated food: {food_data.get('name', 'Unknown')}")
+                elif barcode in pending_by_barcode:
+                    # Duplicate barcode earlier in this payload: merge into
+                    # the pending insert
+                    pending_by_barcode[barcode].update(food_data)
+                    results["updated"] += 1
+                    logger.info(f"Updated food: {food_data.get('name', 'Unknown')}")
                 else:
-                    # Create new food
-                    create_food(db, food_data)
-                    results["inserted"] += 1
-                    logger.info(f"Inserted food: {food_data.get('name', 'Unknown')}")
-                    
+                    # Collect for one bulk INSERT below; the column default
+                    # would otherwise fill quantity
+                    food_data.setdefault('quantity', 0)
+                    new_records.append((index, food_data))
+                    if barcode is not None:
+                        pending_by_barcode[barcode] = food_data
+
             except Exception as e:
                 results["errors"] += 1
                 error_msg = f"Row {index}: {str(e)}"
                 results["error_details"].append(error_msg)
                 logger.error(error_msg)
+
+        if new_records:
+            try:
+                # One executemany INSERT for every new row instead of an ORM
+                # object plus commit per row. executemany needs homogeneous
+                # keys, so absent optional fields become explicit NULLs.
+                keys = set().union(*(record for _, record in new_records))
+                db.execute(
+                    insert(Food),
+                    [{key: record.get(key) for key in keys} for _, record in new_records]
+                )
+                db.commit()
+                results["inserted"] = len(new_records)
+            except Exception as e:
+                db.rollback()
+                # Retry row by row so one bad record doesn't discard the
+                # whole batch and error_details stays per-row
+                logger.warning(f"Bulk insert failed, retrying per row: {e}")
+                for index, record in new_records:
+                    try:
+                        create_food(db, record)
+                        results["inserted"] += 1
+                    except Exception as row_error:
+                        results["errors"] += 1
+                        error_msg = f"Row {index}: {str(row_error)}"
+                        results["error_details"].append(error_msg)
+                        logger.error(error_msg)
     
     logger.info(f"Bulk import completed: {results['inserted']} inserted, {results['updated']} updated, {results['errors']} errors")
     return results
 
 
+def _bulk_import_via_copy(df: "pd.DataFrame", results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fast path for large imports on PostgreSQL.
+    Rows with known barcodes are updated through the ORM; everything else is
+    streamed to the foods table in a single COPY instead of per-row INSERTs.
+
+    Args:
+        df: Pandas DataFrame containing food data
+        results: Partially filled results dictionary to accumulate into
+
+    Returns:
+        Dict: Summary of import results
+    """
+    import pandas as pd
+
+    new_records = []
+    # Pending inserts by barcode so in-payload repeats merge instead of
+    # inserting twice (same upsert semantics as the ORM path)
+    pending_by_barcode = {}
+
+    with get_db_session() as db:
+        # One query to find which barcodes already exist
+        barcodes = df['barcode'].dropna().unique().tolist() if 'barcode' in df.columns else []
+        existing_barcodes = {
+            barcode for (barcode,) in
+            db.query(Food.barcode).filter(Food.barcode.in_(barcodes)).all()
+        }
+
+        for index, row in df.iterrows():
+            try:
+                food_data = row.to_dict()
+                # Drop NaN cells; the scalar check keeps list values like
+                # allergens from blowing up pd.isna
+                food_data = {
+                    k: v for k, v in food_data.items()
+                    if not (pd.api.types.is_scalar(v) and pd.isna(v))
+                }
+
+                # Convert expiry_date string to date object if present
+                if 'expiry_date' in food_data and isinstance(food_data['expiry_date'], str):
+                    try:
+                        food_data['expiry_date'] = datetime.strptime(food_data['expiry_date'], '%Y-%m-%d').date()
+                    except ValueError:
+                        food_data.pop('expiry_date', None)
+
+                barcode = food_data.get('barcode')
+                if barcode in existing_barcodes:
+                    existing_food = get_food_by_barcode(db, barcode)
+                    for key, value in food_data.items():
+                        if hasattr(existing_food, key) and key != 'id':
+                            setattr(existing_food, key, value)
+                    results["updated"] += 1
+                elif barcode in pending_by_barcode:
+                    # Duplicate barcode earlier in this payload: merge into
+                    # the pending insert
+                    pending_by_barcode[barcode].update(food_data)
+                    results["updated"] += 1
+                else:
+                    # COPY with an explicit column list bypasses the table
+                    # default, so fill quantity here
+                    food_data.setdefault('quantity', 0)
+                    new_records.append((index, food_data))
+                    if barcode is not None:
+                        pending_by_barcode[barcode] = food_data
+            except Exception as e:
+                results["errors"] += 1
+                error_msg = f"Row {index}: {str(e)}"
+                results["error_details"].append(error_msg)
+                logger.error(error_msg)
+
+    if new_records:
+        copy_buffer = io.StringIO()
+        writer = csv.writer(copy_buffer)
+        for _, food_data in new_records:
+            values = dict(food_data)
+            # JSON column: COPY needs the serialized form
+            if values.get('allergens') is not None:
+                values['allergens'] = json.dumps(values['allergens'])
+            # Undo the float64 promotion pandas applies to sparse numeric
+            # columns; COPY would reject '3.0' for an INTEGER column
+            for column in FOOD_INTEGER_COLUMNS:
+                if values.get(column) is not None:
+                    values[column] = int(values[column])
+            writer.writerow(
+                [str(uuid.uuid4())] +
+                [values.get(column) for column in FOOD_COPY_COLUMNS[1:]]
+            )
+
+        copy_buffer.seek(0)
+        raw = get_engine().raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY foods ({', '.join(FOOD_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    copy_buffer
+                )
+            raw.commit()
+            results["inserted"] = len(new_records)
+        except Exception as e:
+            raw.rollback()
+            # Retry row by row through the ORM so one malformed row doesn't
+            # discard the whole batch and error_details stays per-row
+            logger.warning(f"COPY failed, retrying per row: {e}")
+            with get_db_session() as db:
+                for index, food_data in new_records:
+                    try:
+                        create_food(db, food_data)
+                        results["inserted"] += 1
+                    except Exception as row_error:
+                        results["errors"] += 1
+                        error_msg = f"Row {index}: {str(row_error)}"
+                        results["error_details"].append(error_msg)
+                        logger.error(error_msg)
+        finally:
+            raw.close()
+
+    logger.info(f"Bulk import completed: {results['inserted']} inserted, {results['updated']} updated, {results['errors']} errors")
+    return results
+
+
 def get_foods_by_category(db: Session, category: str) -> List[Food]:
     """
     Get all foods in a specific category.
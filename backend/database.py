@@ -21,14 +21,29 @@ DATABASE_URL = os.getenv(
     "sqlite:///./food_tracking.db"  # Default to SQLite for easier setup
 )
 
-# Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=StaticPool,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False  # Set to True for SQL query logging
-)
+# Create engine with connection pooling. The default QueuePool gives each
+# session its own connection, which matters now that handlers run
+# concurrently on the threadpool; a shared single connection would let one
+# request's commit/rollback flush another request's work.
+if DATABASE_URL.startswith("sqlite"):
+    # SQLite connections are bound to their creating thread by default;
+    # in-memory databases additionally need one persistent connection
+    engine_kwargs = {"connect_args": {"check_same_thread": False}}
+    if ":memory:" in DATABASE_URL:
+        engine_kwargs["poolclass"] = StaticPool
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        echo=False,  # Set to True for SQL query logging
+        **engine_kwargs
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=False  # Set to True for SQL query logging
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
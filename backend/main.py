@@ -3,16 +3,21 @@ FastAPI application for the food tracking system.
 Provides REST API endpoints for managing food inventory and nutrition logs.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 from contextlib import asynccontextmanager
+import hashlib
 import logging
-import pandas as pd
+import os
+import orjson
 from datetime import datetime
 
 from database import get_db, create_tables, test_connection
+from cache import init_cache, cache_get, cache_set, invalidate_foods
 from crud import (
     create_food, get_food_by_barcode, get_food_by_id, get_all_foods,
     search_foods, update_food, update_quantity, delete_food, delete_food_by_barcode,
@@ -22,13 +27,25 @@ from crud import (
 from schemas import (
     FoodCreate, FoodUpdate, FoodResponse, NutritionLogCreate, NutritionLogResponse,
     FoodSearchRequest, QuantityUpdateRequest, BulkImportRequest, BulkImportResponse,
-    FoodInventoryResponse, ExpiringFoodsRequest, LowStockRequest, ErrorResponse
+    FoodInventoryResponse, ExpiringFoodsRequest, LowStockRequest
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per DataFrame chunk during bulk imports; keeps peak memory bounded
+# by the chunk size instead of the full request payload
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "10000"))
+
+# Clients may reuse single-food responses for this long before revalidating
+CACHE_CONTROL_HEADER = "max-age=30"
+
+
+def _make_etag(payload: Any) -> str:
+    """Content hash used as the ETag for single-food responses."""
+    return hashlib.md5(orjson.dumps(payload)).hexdigest()
+
 # Lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,6 +56,7 @@ async def lifespan(app: FastAPI):
             logger.info("Database connection successful")
         else:
             logger.error("Database connection failed")
+        init_cache()
     except Exception as e:
         logger.error(f"Startup error: {e}")
     yield
@@ -51,9 +69,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Compress large JSON responses (e.g. 1000-row food lists); small payloads
+# are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -69,17 +92,18 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now()}
+    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
 # Food endpoints
 @app.post("/foods/", response_model=FoodResponse, status_code=status.HTTP_201_CREATED)
-async def create_food_endpoint(food: FoodCreate, db: Session = Depends(get_db)):
+def create_food_endpoint(food: FoodCreate, db: Session = Depends(get_db)):
     """Create a new food item (allows duplicates)."""
     try:
         # Always create new food item (no duplicate checking)
-        food_data = food.dict()
+        food_data = food.model_dump()
         created_food = create_food(db, food_data)
+        invalidate_foods()
         logger.info(f"Created new food: {food.barcode}")
         return created_food
     except HTTPException:
@@ -93,7 +117,12 @@ async def create_food_endpoint(food: FoodCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/foods/{food_id}", response_model=FoodResponse)
-async def get_food_endpoint(food_id: str, db: Session = Depends(get_db)):
+def get_food_endpoint(
+    food_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get a food item by ID."""
     food = get_food_by_id(db, food_id)
     if not food:
@@ -101,34 +130,59 @@ async def get_food_endpoint(food_id: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Food not found"
         )
+    etag = _make_etag(food.to_dict())
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_HEADER
     return food
 
 
 @app.get("/foods/barcode/{barcode}", response_model=FoodResponse)
-async def get_food_by_barcode_endpoint(barcode: str, db: Session = Depends(get_db)):
+def get_food_by_barcode_endpoint(
+    barcode: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get a food item by barcode."""
-    food = get_food_by_barcode(db, barcode)
-    if not food:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Food not found"
-        )
-    return food
+    cache_key = f"barcode:{barcode}"
+    payload = cache_get(cache_key)
+    if payload is None:
+        food = get_food_by_barcode(db, barcode)
+        if not food:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Food not found"
+            )
+        payload = food.to_dict()
+        cache_set(cache_key, payload)
+    etag = _make_etag(payload)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_HEADER
+    return payload
 
 
 @app.get("/foods/", response_model=List[FoodResponse])
-async def get_foods_endpoint(
+def get_foods_endpoint(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
 ):
     """Get all food items with pagination."""
+    cache_key = f"list:{skip}:{limit}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
     foods = get_all_foods(db, skip=skip, limit=limit)
+    cache_set(cache_key, [food.to_dict() for food in foods])
     return foods
 
 
 @app.get("/foods/search/", response_model=List[FoodResponse])
-async def search_foods_endpoint(
+def search_foods_endpoint(
     q: str = Query(..., description="Search query"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -140,14 +194,15 @@ async def search_foods_endpoint(
 
 
 @app.put("/foods/{food_id}", response_model=FoodResponse)
-async def update_food_endpoint(
+def update_food_endpoint(
     food_id: str,
     food_update: FoodUpdate,
     db: Session = Depends(get_db)
 ):
     """Update a food item."""
-    # Filter out None values
-    update_data = {k: v for k, v in food_update.dict().items() if v is not None}
+    # Only apply fields the client actually sent; this also lets clients
+    # set a field to null explicitly, which filtering out None values broke
+    update_data = food_update.model_dump(exclude_unset=True)
     
     if not update_data:
         raise HTTPException(
@@ -161,11 +216,12 @@ async def update_food_endpoint(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Food not found"
         )
+    invalidate_foods()
     return updated_food
 
 
 @app.put("/foods/{food_id}/quantity", response_model=FoodResponse)
-async def update_quantity_endpoint(
+def update_quantity_endpoint(
     food_id: str,
     quantity_update: QuantityUpdateRequest,
     db: Session = Depends(get_db)
@@ -179,11 +235,12 @@ async def update_quantity_endpoint(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Food not found"
         )
+    invalidate_foods()
     return updated_food
 
 
 @app.delete("/foods/{food_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_food_endpoint(food_id: str, db: Session = Depends(get_db)):
+def delete_food_endpoint(food_id: str, db: Session = Depends(get_db)):
     """Delete a food item."""
     success = delete_food(db, food_id)
     if not success:
@@ -191,10 +248,11 @@ async def delete_food_endpoint(food_id: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Food not found"
         )
+    invalidate_foods()
 
 
 @app.delete("/foods/barcode/{barcode}", status_code=status.HTTP_200_OK)
-async def delete_food_by_barcode_endpoint(barcode: str, db: Session = Depends(get_db)):
+def delete_food_by_barcode_endpoint(barcode: str, db: Session = Depends(get_db)):
     """Delete all food items with a specific barcode."""
     success = delete_food_by_barcode(db, barcode)
     if not success:
@@ -202,12 +260,13 @@ async def delete_food_by_barcode_endpoint(barcode: str, db: Session = Depends(ge
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No food items found with this barcode"
         )
+    invalidate_foods()
     return {"message": f"All food items with barcode {barcode} have been deleted"}
 
 
 # Nutrition log endpoints
 @app.post("/nutrition-logs/", response_model=NutritionLogResponse, status_code=status.HTTP_201_CREATED)
-async def create_nutrition_log_endpoint(
+def create_nutrition_log_endpoint(
     nutrition_log: NutritionLogCreate,
     db: Session = Depends(get_db)
 ):
@@ -223,11 +282,14 @@ async def create_nutrition_log_endpoint(
     created_log = log_nutrition_event(
         db, str(nutrition_log.food_id), nutrition_log.quantity, nutrition_log.action
     )
+    # The DB trigger updates foods.quantity on log inserts, so cached
+    # inventory responses are stale too
+    invalidate_foods()
     return created_log
 
 
 @app.get("/nutrition-logs/", response_model=List[NutritionLogResponse])
-async def get_nutrition_logs_endpoint(
+def get_nutrition_logs_endpoint(
     food_id: Optional[str] = Query(None, description="Filter by food ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -240,16 +302,39 @@ async def get_nutrition_logs_endpoint(
 
 # Bulk operations
 @app.post("/foods/bulk-import", response_model=BulkImportResponse)
-async def bulk_import_endpoint(
+def bulk_import_endpoint(
     import_data: BulkImportRequest,
     db: Session = Depends(get_db)
 ):
     """Import multiple food items from a list."""
+    # Imported here so workers that never bulk-import don't pay pandas'
+    # startup time and memory; cached after the first call
+    import pandas as pd
+
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame(import_data.data)
-        results = bulk_import_from_dataframe(df)
-        return BulkImportResponse(**results)
+        # Process the payload in chunks so peak memory stays bounded
+        results = {
+            "total_rows": 0,
+            "inserted": 0,
+            "updated": 0,
+            "errors": 0,
+            "error_details": []
+        }
+        for start in range(0, len(import_data.data), BULK_IMPORT_CHUNK_SIZE):
+            chunk = import_data.data[start:start + BULK_IMPORT_CHUNK_SIZE]
+            df = pd.DataFrame(chunk)
+            # Preserve absolute row numbers in error messages
+            df.index = range(start, start + len(df))
+            partial = bulk_import_from_dataframe(df)
+            results["total_rows"] += partial["total_rows"]
+            results["inserted"] += partial["inserted"]
+            results["updated"] += partial["updated"]
+            results["errors"] += partial["errors"]
+            results["error_details"].extend(partial["error_details"])
+        invalidate_foods()
+        # The summary dict is built by our own CRUD layer with the right
+        # types, so skip Pydantic validation on the way out
+        return BulkImportResponse.model_construct(**results)
     except Exception as e:
         logger.error(f"Bulk import error: {e}")
         raise HTTPException(
@@ -260,35 +345,50 @@ async def bulk_import_endpoint(
 
 # Inventory management endpoints
 @app.get("/inventory/", response_model=List[FoodResponse])
-async def get_inventory_endpoint(
+def get_inventory_endpoint(
     category: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db)
 ):
     """Get food inventory, optionally filtered by category."""
+    cache_key = f"inventory:{category or 'all'}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
     if category:
         foods = get_foods_by_category(db, category)
     else:
         foods = get_all_foods(db)
+    cache_set(cache_key, [food.to_dict() for food in foods])
     return foods
 
 
 @app.get("/inventory/expiring", response_model=List[FoodResponse])
-async def get_expiring_foods_endpoint(
+def get_expiring_foods_endpoint(
     days_ahead: int = Query(7, ge=1, le=365, description="Days ahead to check"),
     db: Session = Depends(get_db)
 ):
     """Get foods that are expiring within the specified number of days."""
+    cache_key = f"expiring:{days_ahead}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
     foods = get_expiring_foods(db, days_ahead)
+    cache_set(cache_key, [food.to_dict() for food in foods])
     return foods
 
 
 @app.get("/inventory/low-stock", response_model=List[FoodResponse])
-async def get_low_stock_foods_endpoint(
+def get_low_stock_foods_endpoint(
     threshold: int = Query(5, ge=0, description="Quantity threshold"),
     db: Session = Depends(get_db)
 ):
     """Get foods with low stock (quantity below threshold)."""
+    cache_key = f"low-stock:{threshold}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
     foods = get_low_stock_foods(db, threshold)
+    cache_set(cache_key, [food.to_dict() for food in foods])
     return foods
 
 
@@ -296,10 +396,13 @@ async def get_low_stock_foods_endpoint(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
-    return ErrorResponse(
-        detail=exc.detail,
-        error_code=str(exc.status_code),
-        timestamp=datetime.now()
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "detail": exc.detail,
+            "error_code": str(exc.status_code),
+            "timestamp": datetime.utcnow().isoformat()
+        }
     )
 
 
@@ -307,13 +410,26 @@ async def http_exception_handler(request, exc):
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {exc}")
-    return ErrorResponse(
-        detail="Internal server error",
-        error_code="500",
-        timestamp=datetime.now()
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "detail": "Internal server error",
+            "error_code": "500",
+            "timestamp": datetime.utcnow().isoformat()
+        }
     )
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools come with uvicorn[standard]; one worker per core.
+    # The app is passed as an import string because multi-worker mode
+    # requires it. create_tables() in lifespan is idempotent across workers.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count()
+    )
@@ -3,7 +3,7 @@ SQLAlchemy models for the food tracking system.
 Defines the database schema using SQLAlchemy ORM.
 """
 
-from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Text, JSON, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Text, JSON, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -31,10 +31,15 @@ class Food(Base):
     sodium = Column(Float)
     allergens = Column(JSON)
     expiry_date = Column(Date, index=True)
-    quantity = Column(Integer, default=0)
+    quantity = Column(Integer, default=0, index=True)
     location = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
+
+    # Partial index to accelerate the low-stock inventory query on PostgreSQL
+    __table_args__ = (
+        Index('ix_foods_low_stock', 'quantity', postgresql_where=text('quantity < 20')),
+    )
+
     # Relationship to nutrition logs
     nutrition_logs = relationship("NutritionLog", back_populates="food", cascade="all, delete-orphan")
     
@@ -8,8 +8,19 @@ import pandas as pd
 import requests
 import json
 from datetime import datetime, date
+from requests.adapters import HTTPAdapter, Retry
 from typing import List, Dict, Any
 
+# Shared session: reuses TCP connections across imports and retries
+# transient server errors
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
 def create_sample_dataframe() -> pd.DataFrame:
     """
     Create a properly formatted DataFrame for import.
@@ -46,25 +57,22 @@ def convert_string_dates_to_objects(df: pd.DataFrame) -> pd.DataFrame:
     If your DataFrame has date strings, convert them to date objects.
     """
     if 'expiry_date' in df.columns:
-        # Convert string dates to date objects
-        df['expiry_date'] = pd.to_datetime(df['expiry_date']).dt.date
-    
+        # Convert string dates to date objects; an explicit format keeps the
+        # parsing in C and errors='coerce' turns bad rows into NaT
+        df['expiry_date'] = pd.to_datetime(
+            df['expiry_date'], format='%Y-%m-%d', errors='coerce'
+        ).dt.date
+
     return df
 
 def prepare_dataframe_for_import(df: pd.DataFrame) -> List[Dict[str, Any]]:
     """
     Prepare DataFrame for API import.
     """
-    # Convert to list of dictionaries
-    data = df.to_dict('records')
-    
-    # Handle NaN values
-    for item in data:
-        for key, value in item.items():
-            if pd.isna(value):
-                item[key] = None
-    
-    return data
+    # Replace NaN with None in one vectorized pass, then convert
+    df = df.astype(object).where(df.notna(), None)
+
+    return df.to_dict('records')
 
 def import_to_database(data: List[Dict[str, Any]], api_url: str = "http://localhost:8000") -> Dict[str, Any]:
     """
@@ -73,7 +81,7 @@ def import_to_database(data: List[Dict[str, Any]], api_url: str = "http://localh
     url = f"{api_url}/foods/bulk-import"
     payload = {"data": data}
     
-    response = requests.post(url, json=payload)
+    response = _session.post(url, json=payload, timeout=(3, 30))
     response.raise_for_status()
     return response.json()
 
@@ -121,30 +129,63 @@ if __name__ == "__main__":
         print(f"Import error: {e}")
 
 # Additional helper functions for common scenarios
+
+# Columns the import API understands; anything else is dropped at read time
+EXPECTED_COLUMNS = [
+    'barcode', 'name', 'brand', 'category', 'calories', 'protein', 'fat',
+    'carbs', 'fiber', 'sugars', 'sodium', 'allergens', 'expiry_date',
+    'quantity', 'location', 'created_at', 'updated_at'
+]
+
+DATE_COLUMNS = ['expiry_date', 'created_at', 'updated_at']
+
+# Explicit dtypes so the reader downcasts in one pass; low-cardinality
+# string columns use 'category' to shrink memory
+COLUMN_DTYPES = {
+    'barcode': 'string',
+    'name': 'string',
+    'brand': 'category',
+    'category': 'category',
+    'location': 'category',
+    'calories': 'Int32',
+    'quantity': 'Int32',
+}
+
 def load_from_csv_with_dates(csv_file: str) -> pd.DataFrame:
     """
-    Load CSV and convert date columns properly.
+    Load CSV with explicit dtypes and date parsing done by the C parser.
     """
-    df = pd.read_csv(csv_file)
-    
-    # Convert date columns if they exist
-    date_columns = ['expiry_date', 'created_at', 'updated_at']
-    for col in date_columns:
+    # Peek at the header so we only request columns that actually exist
+    header = pd.read_csv(csv_file, nrows=0).columns
+
+    df = pd.read_csv(
+        csv_file,
+        usecols=[col for col in header if col in EXPECTED_COLUMNS],
+        dtype={col: dtype for col, dtype in COLUMN_DTYPES.items() if col in header},
+        parse_dates=[col for col in header if col in DATE_COLUMNS]
+    )
+
+    # Convert parsed datetimes to date objects (column-level, no re-parse)
+    for col in DATE_COLUMNS:
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col]).dt.date
-    
+            df[col] = df[col].dt.date
+
     return df
 
 def load_from_excel_with_dates(excel_file: str, sheet_name: str = None) -> pd.DataFrame:
     """
-    Load Excel file and convert date columns properly.
+    Load Excel file with explicit dtypes and convert date columns properly.
     """
-    df = pd.read_excel(excel_file, sheet_name=sheet_name)
-    
-    # Convert date columns if they exist
-    date_columns = ['expiry_date', 'created_at', 'updated_at']
-    for col in date_columns:
+    df = pd.read_excel(
+        excel_file,
+        sheet_name=sheet_name,
+        usecols=lambda col: col in EXPECTED_COLUMNS,
+        dtype=COLUMN_DTYPES
+    )
+
+    # Excel cells usually come back as datetimes already; coerce the rest
+    for col in DATE_COLUMNS:
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col]).dt.date
-    
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+
     return df